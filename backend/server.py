@@ -1,15 +1,25 @@
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Awaitable, Callable, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import json
 import os
+import time
 import uuid
 from motor.motor_asyncio import AsyncIOMotorClient
-from contextlib import asynccontextmanager
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from contextlib import asynccontextmanager, suppress
 import asyncio
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 # Database connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
@@ -19,6 +29,21 @@ db = client.finance_tools_db
 # OpenAI configuration
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
+# Startup configuration
+STARTUP_RETRY_SECONDS = 5
+DUPLICATE_KEY_ERROR_CODE = 11000
+STATS_BACKFILL_CLAIM_SECONDS = 600
+
+# HTTP caching configuration
+CATALOG_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+STATS_CACHE_CONTROL = "public, max-age=60"
+USER_CACHE_CONTROL = "private, no-store"
+COMPRESSION_MIN_SIZE = 1000
+
+# Popularity prior smoothing: pseudo-saves over pseudo-impressions
+PRIOR_SAVES = 1
+PRIOR_IMPRESSIONS = 10
+
 # Pydantic models
 class QuestionnaireResponse(BaseModel):
     position: str
@@ -49,127 +74,289 @@ class SavedTool(BaseModel):
     user_id: str
     tool_id: str
 
+# Curated financial tools, keyed by name when seeding
+CURATED_TOOLS = [
+    {
+        "name": "Tableau",
+        "category": "Data Visualization",
+        "description": "Leading business intelligence and data visualization platform",
+        "pricing": "Starting at $70/month per user",
+        "website": "https://www.tableau.com",
+        "features": ["Interactive dashboards", "Real-time analytics", "Data blending", "Mobile support"],
+        "target_audience": ["Data analysts", "Business users", "Executives"]
+    },
+    {
+        "name": "Power BI",
+        "category": "Data Visualization",
+        "description": "Microsoft's business analytics solution",
+        "pricing": "Starting at $10/month per user",
+        "website": "https://powerbi.microsoft.com",
+        "features": ["Excel integration", "Cloud connectivity", "AI insights", "Custom visualizations"],
+        "target_audience": ["Excel users", "Business analysts", "IT professionals"]
+    },
+    {
+        "name": "Python (pandas/numpy)",
+        "category": "Programming Tools",
+        "description": "Open-source data analysis and manipulation libraries",
+        "pricing": "Free",
+        "website": "https://pandas.pydata.org",
+        "features": ["Data manipulation", "Statistical analysis", "Machine learning", "Automation"],
+        "target_audience": ["Data scientists", "Analysts", "Developers"]
+    },
+    {
+        "name": "Alteryx",
+        "category": "Data Preparation",
+        "description": "Self-service data analytics platform",
+        "pricing": "Starting at $5,195/year",
+        "website": "https://www.alteryx.com",
+        "features": ["Data preparation", "Advanced analytics", "Predictive modeling", "Workflow automation"],
+        "target_audience": ["Data analysts", "Business analysts", "Data scientists"]
+    },
+    {
+        "name": "Qlik Sense",
+        "category": "Data Visualization",
+        "description": "Associative analytics platform",
+        "pricing": "Starting at $30/month per user",
+        "website": "https://www.qlik.com",
+        "features": ["Associative model", "Self-service analytics", "Mobile apps", "AI insights"],
+        "target_audience": ["Business users", "Data analysts", "IT teams"]
+    },
+    {
+        "name": "Looker",
+        "category": "Business Intelligence",
+        "description": "Modern business intelligence platform",
+        "pricing": "Contact for pricing",
+        "website": "https://looker.com",
+        "features": ["Data modeling", "Embedded analytics", "API-first", "Real-time insights"],
+        "target_audience": ["Data teams", "Developers", "Business users"]
+    },
+    {
+        "name": "SAS",
+        "category": "Statistical Software",
+        "description": "Advanced analytics and statistical software",
+        "pricing": "Contact for pricing",
+        "website": "https://www.sas.com",
+        "features": ["Advanced statistics", "Machine learning", "Data mining", "Forecasting"],
+        "target_audience": ["Statisticians", "Data scientists", "Researchers"]
+    },
+    {
+        "name": "SPSS",
+        "category": "Statistical Software",
+        "description": "Statistical analysis software package",
+        "pricing": "Starting at $99/month",
+        "website": "https://www.ibm.com/spss",
+        "features": ["Statistical analysis", "Data mining", "Survey research", "Predictive analytics"],
+        "target_audience": ["Researchers", "Analysts", "Students"]
+    },
+    {
+        "name": "R",
+        "category": "Programming Tools",
+        "description": "Open-source statistical computing language",
+        "pricing": "Free",
+        "website": "https://www.r-project.org",
+        "features": ["Statistical computing", "Data visualization", "Machine learning", "Extensive packages"],
+        "target_audience": ["Statisticians", "Data scientists", "Researchers"]
+    },
+    {
+        "name": "Excel Power Query",
+        "category": "Data Preparation",
+        "description": "Excel's data connection and preparation tool",
+        "pricing": "Included with Excel",
+        "website": "https://docs.microsoft.com/en-us/power-query/",
+        "features": ["Data transformation", "Multiple data sources", "Automation", "Easy to use"],
+        "target_audience": ["Excel users", "Business analysts", "Finance teams"]
+    }
+]
+
+# Hash of the curated tools, stored once seeding succeeds
+SEED_HASH = hashlib.sha256(json.dumps(CURATED_TOOLS, sort_keys=True).encode()).hexdigest()
+
+async def remove_duplicate_tools():
+    """Keep the oldest tool for each name, pointing saved tools at it"""
+    
+    duplicates_cursor = db.tools.aggregate([
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": "$name", "ids": {"$push": "$_id"}, "tool_ids": {"$push": "$id"}, "copies": {"$sum": 1}}},
+        {"$match": {"copies": {"$gt": 1}}}
+    ])
+    async for duplicate in duplicates_cursor:
+        keep_tool_id, *extra_tool_ids = duplicate["tool_ids"]
+        await db.saved_tools.update_many(
+            {"tool_id": {"$in": extra_tool_ids}},
+            {"$set": {"tool_id": keep_tool_id}}
+        )
+        await db.tools.delete_many({"_id": {"$in": duplicate["ids"][1:]}})
+        print(f"Removed {len(extra_tool_ids)} duplicate entries for tool {duplicate['_id']}")
+
 # Initialize curated financial tools
 async def initialize_tools():
     """Initialize the database with curated financial data analysis tools"""
     tools_collection = db.tools
     
-    # Check if tools already exist
-    existing_tools = await tools_collection.count_documents({})
-    if existing_tools > 0:
+    # Check if this seed has already been applied
+    seed = await db.meta.find_one({"_id": "seed"})
+    if seed and seed.get("hash") == SEED_HASH:
         return
     
-    curated_tools = [
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Tableau",
-            "category": "Data Visualization",
-            "description": "Leading business intelligence and data visualization platform",
-            "pricing": "Starting at $70/month per user",
-            "website": "https://www.tableau.com",
-            "features": ["Interactive dashboards", "Real-time analytics", "Data blending", "Mobile support"],
-            "target_audience": ["Data analysts", "Business users", "Executives"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Power BI",
-            "category": "Data Visualization",
-            "description": "Microsoft's business analytics solution",
-            "pricing": "Starting at $10/month per user",
-            "website": "https://powerbi.microsoft.com",
-            "features": ["Excel integration", "Cloud connectivity", "AI insights", "Custom visualizations"],
-            "target_audience": ["Excel users", "Business analysts", "IT professionals"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Python (pandas/numpy)",
-            "category": "Programming Tools",
-            "description": "Open-source data analysis and manipulation libraries",
-            "pricing": "Free",
-            "website": "https://pandas.pydata.org",
-            "features": ["Data manipulation", "Statistical analysis", "Machine learning", "Automation"],
-            "target_audience": ["Data scientists", "Analysts", "Developers"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Alteryx",
-            "category": "Data Preparation",
-            "description": "Self-service data analytics platform",
-            "pricing": "Starting at $5,195/year",
-            "website": "https://www.alteryx.com",
-            "features": ["Data preparation", "Advanced analytics", "Predictive modeling", "Workflow automation"],
-            "target_audience": ["Data analysts", "Business analysts", "Data scientists"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Qlik Sense",
-            "category": "Data Visualization",
-            "description": "Associative analytics platform",
-            "pricing": "Starting at $30/month per user",
-            "website": "https://www.qlik.com",
-            "features": ["Associative model", "Self-service analytics", "Mobile apps", "AI insights"],
-            "target_audience": ["Business users", "Data analysts", "IT teams"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Looker",
-            "category": "Business Intelligence",
-            "description": "Modern business intelligence platform",
-            "pricing": "Contact for pricing",
-            "website": "https://looker.com",
-            "features": ["Data modeling", "Embedded analytics", "API-first", "Real-time insights"],
-            "target_audience": ["Data teams", "Developers", "Business users"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "SAS",
-            "category": "Statistical Software",
-            "description": "Advanced analytics and statistical software",
-            "pricing": "Contact for pricing",
-            "website": "https://www.sas.com",
-            "features": ["Advanced statistics", "Machine learning", "Data mining", "Forecasting"],
-            "target_audience": ["Statisticians", "Data scientists", "Researchers"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "SPSS",
-            "category": "Statistical Software",
-            "description": "Statistical analysis software package",
-            "pricing": "Starting at $99/month",
-            "website": "https://www.ibm.com/spss",
-            "features": ["Statistical analysis", "Data mining", "Survey research", "Predictive analytics"],
-            "target_audience": ["Researchers", "Analysts", "Students"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "R",
-            "category": "Programming Tools",
-            "description": "Open-source statistical computing language",
-            "pricing": "Free",
-            "website": "https://www.r-project.org",
-            "features": ["Statistical computing", "Data visualization", "Machine learning", "Extensive packages"],
-            "target_audience": ["Statisticians", "Data scientists", "Researchers"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Excel Power Query",
-            "category": "Data Preparation",
-            "description": "Excel's data connection and preparation tool",
-            "pricing": "Included with Excel",
-            "website": "https://docs.microsoft.com/en-us/power-query/",
-            "features": ["Data transformation", "Multiple data sources", "Automation", "Easy to use"],
-            "target_audience": ["Excel users", "Business analysts", "Finance teams"]
-        }
+    # Unique names stop replicas seeding concurrently from inserting the same tool twice.
+    # Seeding still proceeds without the index, since upserts by name are idempotent on their own
+    try:
+        await remove_duplicate_tools()
+        await tools_collection.create_index("name", unique=True)
+    except Exception as e:
+        print(f"Error creating unique tool name index: {e}")
+    
+    # Upsert by name so re-seeding keeps existing ids and AI summaries
+    operations = [
+        UpdateOne(
+            {"name": tool["name"]},
+            {"$set": tool, "$setOnInsert": {"id": str(uuid.uuid4())}},
+            upsert=True
+        )
+        for tool in CURATED_TOOLS
     ]
+    for attempt in range(2):
+        try:
+            await tools_collection.bulk_write(operations, ordered=False)
+            break
+        except BulkWriteError as e:
+            # Another replica inserted a tool first; retrying matches its document
+            write_errors = e.details.get("writeErrors", [])
+            if attempt or any(error["code"] != DUPLICATE_KEY_ERROR_CODE for error in write_errors):
+                raise
     
-    await tools_collection.insert_many(curated_tools)
+    await db.meta.update_one(
+        {"_id": "seed"},
+        {"$set": {"hash": SEED_HASH, "seeded_at": datetime.utcnow()}},
+        upsert=True
+    )
+    await bump_catalog_version()
     print("Curated financial tools initialized successfully!")
 
+# Catalog versioning for HTTP cache validation
+async def get_catalog_version() -> int:
+    """Get the current catalog version"""
+    meta = await db.meta.find_one({"_id": "catalog"})
+    return meta.get("version", 0) if meta else 0
+
+async def bump_catalog_version():
+    """Invalidate cached catalog responses after any change to the tools collection"""
+    await db.meta.update_one({"_id": "catalog"}, {"$inc": {"version": 1}}, upsert=True)
+
+# Indexes backing the per-request lookups
+async def remove_duplicates(collection, keys: List[str], sum_fields: Tuple[str, ...] = ()):
+    """Collapse documents sharing the same keys into the oldest one, summing counter fields"""
+    
+    group = {
+        "_id": {key: f"${key}" for key in keys},
+        "ids": {"$push": "$_id"},
+        "copies": {"$sum": 1}
+    }
+    for field in sum_fields:
+        group[field] = {"$sum": f"${field}"}
+    
+    duplicates_cursor = collection.aggregate([
+        {"$sort": {"_id": 1}},
+        {"$group": group},
+        {"$match": {"copies": {"$gt": 1}}}
+    ])
+    async for duplicate in duplicates_cursor:
+        keep_id, *extra_ids = duplicate["ids"]
+        if sum_fields:
+            await collection.update_one(
+                {"_id": keep_id},
+                {"$set": {field: duplicate[field] for field in sum_fields}}
+            )
+        await collection.delete_many({"_id": {"$in": extra_ids}})
+        print(f"Removed {len(extra_ids)} duplicate {collection.name} entries for {duplicate['_id']}")
+
+async def create_indexes(indexes: List[Tuple[Any, Any, Dict]]):
+    """Create each index separately, so one failure does not skip the rest"""
+    for collection, keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+        except Exception as e:
+            print(f"Error creating index {keys} on {collection.name}: {e}")
+
+async def ensure_unique_indexes():
+    """Create the unique indexes that saves and counter upserts rely on for correctness"""
+    
+    # Older find-then-insert and upsert races can have left duplicates behind
+    await remove_duplicates(db.saved_tools, ["user_id", "tool_id"])
+    await remove_duplicates(db.tool_stats, ["tool_id"], ("save_count", "impressions"))
+    await remove_duplicates(db.tool_cosaves, ["tool_id", "other_tool_id"], ("count",))
+    
+    await create_indexes([
+        (db.tools, "id", {"unique": True}),
+        (db.saved_tools, [("user_id", ASCENDING), ("tool_id", ASCENDING)], {"unique": True}),
+        (db.tool_stats, "tool_id", {"unique": True}),
+        (db.tool_cosaves, [("tool_id", ASCENDING), ("other_tool_id", ASCENDING)], {"unique": True})
+    ])
+
+async def ensure_lookup_indexes():
+    """Create the sort indexes used by trending and similar tool lookups"""
+    await create_indexes([
+        (db.tool_stats, [("save_count", DESCENDING), ("impressions", DESCENDING)], {}),
+        (db.tool_cosaves, [("tool_id", ASCENDING), ("count", DESCENDING)], {})
+    ])
+
+# Startup progress, reported by /readyz
+startup_state: Dict[str, Any] = {"ready": False, "error": None, "timings_ms": {}}
+
+async def timed_startup_phase(name: str, phase: Callable[[], Awaitable[Any]]):
+    """Run a startup phase and record how long it took"""
+    started = time.perf_counter()
+    try:
+        await phase()
+    finally:
+        startup_state["timings_ms"][name] = round((time.perf_counter() - started) * 1000, 1)
+
+async def warm_catalog_cache():
+    """Build the full catalog response ahead of the first request"""
+    version = await get_catalog_version()
+    content, _ = await build_tools_listing()
+    store_catalog_entry("tools", version, JSONResponse(content).body)
+
+async def run_startup():
+    """Seed the catalog, build unique indexes and backfill counters, mark the app ready, then warm indexes and caches"""
+    
+    # Readiness waits on the phases correctness depends on, retrying until the database is reachable
+    while True:
+        try:
+            await timed_startup_phase("seed", initialize_tools)
+            await timed_startup_phase("unique_indexes", ensure_unique_indexes)
+            # Runs before traffic, so no live $inc can land between its read and its $set
+            await timed_startup_phase("stats_backfill", backfill_tool_stats)
+            break
+        except Exception as e:
+            # Only the error class is exposed by /readyz; details can name hosts and topology
+            startup_state["error"] = type(e).__name__
+            print(f"Error during startup, retrying in {STARTUP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
+    
+    startup_state["ready"] = True
+    startup_state["error"] = None
+    
+    warm_up_phases = (
+        ("lookup_indexes", ensure_lookup_indexes),
+        ("catalog_cache", warm_catalog_cache)
+    )
+    for name, phase in warm_up_phases:
+        try:
+            await timed_startup_phase(name, phase)
+        except Exception as e:
+            print(f"Error during {name} warm-up: {e}")
+    
+    print(f"Startup completed: {startup_state['timings_ms']}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database with curated tools
-    await initialize_tools()
+    # Run startup in the background so the server accepts probes immediately
+    startup_task = asyncio.create_task(run_startup())
     yield
+    startup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await startup_task
 
 app = FastAPI(lifespan=lifespan)
 
@@ -182,6 +369,77 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression, preferring brotli when it is installed
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Serialized catalog responses keyed by route, valid for a single catalog version
+catalog_response_cache: Dict[str, Dict[str, Any]] = {}
+
+def make_etag(body: bytes) -> str:
+    """Build a weak ETag from the response body, valid across content encodings"""
+    return f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    
+    # Weak comparison, as required for If-None-Match
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+def cached_body_response(request: Request, entry: Dict[str, Any]) -> Response:
+    """Serve a cached catalog body, or 304 when the client already has it"""
+    headers = {"ETag": entry["etag"], "Cache-Control": CATALOG_CACHE_CONTROL}
+    if etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+def store_catalog_entry(cache_key: str, version: int, body: bytes) -> Dict[str, Any]:
+    """Cache a serialized catalog body for the given catalog version"""
+    
+    # Drop entries from older catalog versions so the cache stays bounded
+    for key in [key for key, cached in catalog_response_cache.items() if cached["version"] != version]:
+        del catalog_response_cache[key]
+    
+    entry = {"version": version, "body": body, "etag": make_etag(body)}
+    catalog_response_cache[cache_key] = entry
+    return entry
+
+async def catalog_response(
+    request: Request,
+    cache_key: str,
+    build: Callable[[], Awaitable[Tuple[Dict, bool]]]
+) -> Response:
+    """Serve a catalog route with ETag validation, rebuilding only when the catalog version changes"""
+    
+    version = await get_catalog_version()
+    entry = catalog_response_cache.get(cache_key)
+    if entry and entry["version"] == version:
+        return cached_body_response(request, entry)
+    
+    content, cacheable = await build()
+    body = JSONResponse(content).body
+    
+    if not cacheable:
+        return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+    
+    # Stored under the version read before building, so a concurrent update forces a rebuild
+    entry = store_catalog_entry(cache_key, version, body)
+    return cached_body_response(request, entry)
+
 # AI-powered tool recommendation
 async def generate_tool_recommendations(questionnaire: QuestionnaireResponse, tools: List[Dict]) -> List[Dict]:
     """Generate AI-powered tool recommendations based on questionnaire responses"""
@@ -219,6 +477,9 @@ async def generate_tool_recommendations(questionnaire: QuestionnaireResponse, to
     """
     
     try:
+        # Imported on first use to keep cold starts short
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+        
         # Initialize chat with OpenAI
         chat = LlmChat(
             api_key=OPENAI_API_KEY,
@@ -243,8 +504,8 @@ async def generate_tool_recommendations(questionnaire: QuestionnaireResponse, to
         return tools[:5]
 
 # AI-powered tool summary generation
-async def generate_tool_summary(tool: Dict) -> str:
-    """Generate AI summary for a specific tool"""
+async def generate_tool_summary(tool: Dict) -> Optional[str]:
+    """Generate AI summary for a specific tool, or None if the LLM call fails"""
     
     system_message = "You are a financial technology expert. Create concise, informative summaries of financial data analysis tools."
     
@@ -268,6 +529,8 @@ async def generate_tool_summary(tool: Dict) -> str:
     """
     
     try:
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+        
         chat = LlmChat(
             api_key=OPENAI_API_KEY,
             session_id=str(uuid.uuid4()),
@@ -279,7 +542,161 @@ async def generate_tool_summary(tool: Dict) -> str:
         
     except Exception as e:
         print(f"Error generating summary: {e}")
-        return f"Professional {tool['category'].lower()} solution designed for {', '.join(tool['target_audience'])}. Known for {', '.join(tool['features'][:3])}."
+        # Callers fall back without storing, so a transient outage is retried later
+        return None
+
+# Incrementally maintained tool statistics
+async def record_save_stats(user_id: str, tool_id: str, delta: int):
+    """Apply a save (+1) or unsave (-1) to the save and co-save counters"""
+    
+    # Co-save pairs can drift by one when the same user saves or removes two
+    # tools concurrently: each request may see the other's row and update the
+    # shared pair. This is rare enough to accept rather than lock per user;
+    # removing the stats_backfill document from db.meta rebuilds the counters
+    # on the next startup.
+    await db.tool_stats.update_one(
+        {"tool_id": tool_id},
+        {"$inc": {"save_count": delta, "impressions": 0}},
+        upsert=True
+    )
+    
+    # Pair the tool with everything else the user has saved, in both directions
+    other_saved_cursor = db.saved_tools.find(
+        {"user_id": user_id, "tool_id": {"$ne": tool_id}},
+        {"tool_id": 1}
+    )
+    other_saved = await other_saved_cursor.to_list(length=100)
+    
+    operations = []
+    for saved in other_saved:
+        other_id = saved["tool_id"]
+        operations.append(UpdateOne(
+            {"tool_id": tool_id, "other_tool_id": other_id},
+            {"$inc": {"count": delta}},
+            upsert=True
+        ))
+        operations.append(UpdateOne(
+            {"tool_id": other_id, "other_tool_id": tool_id},
+            {"$inc": {"count": delta}},
+            upsert=True
+        ))
+    
+    if operations:
+        await db.tool_cosaves.bulk_write(operations, ordered=False)
+
+async def backfill_tool_stats():
+    """Rebuild the save and co-save counters from saved_tools, once per database"""
+    
+    # Claim the backfill atomically so only one replica runs it. The others wait
+    # for it to finish, and take it over if the claim goes stale
+    while True:
+        backfill = await db.meta.find_one({"_id": "stats_backfill"})
+        if backfill and backfill.get("done"):
+            return
+        
+        claimed_at = datetime.utcnow()
+        try:
+            await db.meta.update_one(
+                {
+                    "_id": "stats_backfill",
+                    "done": {"$ne": True},
+                    "claimed_at": {"$lt": claimed_at - timedelta(seconds=STATS_BACKFILL_CLAIM_SECONDS)}
+                },
+                {"$set": {"done": False, "claimed_at": claimed_at}},
+                upsert=True
+            )
+            break
+        except DuplicateKeyError:
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
+    
+    try:
+        # Count saves per tool and co-saves per ordered pair from the existing rows
+        save_counts: Dict[str, int] = {}
+        pair_counts: Dict[Tuple[str, str], int] = {}
+        users_cursor = db.saved_tools.aggregate([
+            {"$group": {"_id": "$user_id", "tool_ids": {"$addToSet": "$tool_id"}}}
+        ])
+        async for user in users_cursor:
+            for tool_id in user["tool_ids"]:
+                save_counts[tool_id] = save_counts.get(tool_id, 0) + 1
+                for other_id in user["tool_ids"]:
+                    if other_id != tool_id:
+                        pair_counts[(tool_id, other_id)] = pair_counts.get((tool_id, other_id), 0) + 1
+        
+        # Absolute values rather than $inc, so re-running after a partial failure is safe
+        stats_operations = [
+            UpdateOne(
+                {"tool_id": tool_id},
+                {"$set": {"save_count": count}, "$inc": {"impressions": 0}},
+                upsert=True
+            )
+            for tool_id, count in save_counts.items()
+        ]
+        if stats_operations:
+            await db.tool_stats.bulk_write(stats_operations, ordered=False)
+        await db.tool_stats.update_many(
+            {"tool_id": {"$nin": list(save_counts)}},
+            {"$set": {"save_count": 0}}
+        )
+        
+        cosave_operations = [
+            UpdateOne(
+                {"tool_id": tool_id, "other_tool_id": other_id},
+                {"$set": {"count": count}},
+                upsert=True
+            )
+            for (tool_id, other_id), count in pair_counts.items()
+        ]
+        async for cosave in db.tool_cosaves.find({}, {"tool_id": 1, "other_tool_id": 1}):
+            if (cosave["tool_id"], cosave["other_tool_id"]) not in pair_counts:
+                cosave_operations.append(UpdateOne({"_id": cosave["_id"]}, {"$set": {"count": 0}}))
+        if cosave_operations:
+            await db.tool_cosaves.bulk_write(cosave_operations, ordered=False)
+    except Exception:
+        # Release the claim so the startup retry can run the backfill again straight away
+        await db.meta.update_one({"_id": "stats_backfill"}, {"$set": {"claimed_at": datetime.min}})
+        raise
+    
+    await db.meta.update_one(
+        {"_id": "stats_backfill"},
+        {"$set": {"done": True, "completed_at": datetime.utcnow()}},
+        upsert=True
+    )
+    print("Tool statistics backfilled from saved tools")
+
+async def record_impressions(tool_ids: List[str]):
+    """Count one recommendation impression for each of the given tools"""
+    
+    operations = [
+        UpdateOne(
+            {"tool_id": tool_id},
+            {"$inc": {"impressions": 1, "save_count": 0}},
+            upsert=True
+        )
+        for tool_id in tool_ids
+    ]
+    
+    if operations:
+        await db.tool_stats.bulk_write(operations, ordered=False)
+
+def popularity_prior(stats: Optional[Dict]) -> float:
+    """Smoothed save-per-impression rate used to rank recommendations"""
+    
+    stats = stats or {}
+    
+    # Additive smoothing keeps rarely shown tools from dominating on one save,
+    # and gives tools without stats the same prior as ones never shown
+    return (stats.get("save_count", 0) + PRIOR_SAVES) / (stats.get("impressions", 0) + PRIOR_IMPRESSIONS)
+
+async def rank_by_popularity(tools: List[Dict]) -> List[Dict]:
+    """Order tools by popularity prior, keeping the original order for ties"""
+    
+    tool_ids = [tool["id"] for tool in tools]
+    stats_cursor = db.tool_stats.find({"tool_id": {"$in": tool_ids}})
+    stats = await stats_cursor.to_list(length=len(tool_ids) or 1)
+    stats_by_id = {entry["tool_id"]: entry for entry in stats}
+    
+    return sorted(tools, key=lambda tool: popularity_prior(stats_by_id.get(tool["id"])), reverse=True)
 
 # API Routes
 @app.get("/api")
@@ -290,6 +707,21 @@ async def api_root():
 async def root():
     return {"message": "Financial AI Tools Directory API"}
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness probe: the catalog is seeded and the app can serve traffic"""
+    content = {
+        "status": "ready" if startup_state["ready"] else "starting",
+        "error": startup_state["error"],
+        "timings_ms": startup_state["timings_ms"]
+    }
+    return JSONResponse(content, status_code=200 if startup_state["ready"] else 503)
+
 @app.post("/api/questionnaire")
 async def submit_questionnaire(questionnaire: QuestionnaireResponse):
     """Submit questionnaire and get AI-powered tool recommendations"""
@@ -332,6 +764,11 @@ async def submit_questionnaire(questionnaire: QuestionnaireResponse):
         else:
             recommended_tools = recommended_tools[:5]
     
+    try:
+        recommended_tools = await rank_by_popularity(recommended_tools)
+    except Exception as e:
+        print(f"Error ranking recommendations: {e}")
+    
     # Store questionnaire and search history
     questionnaire_data = {
         "id": str(uuid.uuid4()),
@@ -342,14 +779,18 @@ async def submit_questionnaire(questionnaire: QuestionnaireResponse):
     
     await db.questionnaires.insert_one(questionnaire_data)
     
+    try:
+        await record_impressions(questionnaire_data["recommended_tools"])
+    except Exception as e:
+        print(f"Error recording impressions: {e}")
+    
     return {
         "questionnaire_id": questionnaire_data["id"],
         "recommended_tools": recommended_tools
     }
 
-@app.get("/api/tools")
-async def get_all_tools():
-    """Get all available tools"""
+async def build_tools_listing() -> Tuple[Dict, bool]:
+    """Load the full tool catalog for the tools listing"""
     tools_collection = db.tools
     tools_cursor = tools_collection.find({})
     tools = await tools_cursor.to_list(length=100)
@@ -359,37 +800,107 @@ async def get_all_tools():
         if '_id' in tool:
             tool['_id'] = str(tool['_id'])
     
-    return {"tools": tools}
+    return {"tools": tools}, True
 
-@app.get("/api/tools/{tool_id}")
-async def get_tool_details(tool_id: str):
-    """Get detailed information about a specific tool including AI summary"""
+@app.get("/api/tools")
+async def get_all_tools(request: Request):
+    """Get all available tools"""
+    return await catalog_response(request, "tools", build_tools_listing)
+
+@app.get("/api/tools/trending")
+async def get_trending_tools(response: Response, limit: int = 10):
+    """Get the most saved tools"""
     
-    tool = await db.tools.find_one({"id": tool_id})
-    if not tool:
-        raise HTTPException(status_code=404, detail="Tool not found")
+    response.headers["Cache-Control"] = STATS_CACHE_CONTROL
+    limit = max(1, min(limit, 50))
+    stats_cursor = db.tool_stats.find({"save_count": {"$gt": 0}}).sort(
+        [("save_count", -1), ("impressions", -1)]
+    ).limit(limit)
+    stats = await stats_cursor.to_list(length=limit)
     
-    # Convert MongoDB ObjectId to string for JSON serialization
-    if '_id' in tool:
-        tool['_id'] = str(tool['_id'])
+    tool_ids = [entry["tool_id"] for entry in stats]
+    tools_cursor = db.tools.find({"id": {"$in": tool_ids}})
+    tools = await tools_cursor.to_list(length=limit)
+    tools_by_id = {tool["id"]: tool for tool in tools}
     
-    # Generate AI summary if not already available
-    if not tool.get("ai_summary"):
-        try:
-            ai_summary = await generate_tool_summary(tool)
-            tool["ai_summary"] = ai_summary
-            
-            # Update tool in database with AI summary
-            await db.tools.update_one(
-                {"id": tool_id},
-                {"$set": {"ai_summary": ai_summary}}
-            )
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            # Fallback summary
-            tool["ai_summary"] = f"Professional {tool['category'].lower()} solution designed for {', '.join(tool['target_audience'])}. Known for {', '.join(tool['features'][:3])}."
+    trending_tools = []
+    for entry in stats:
+        tool = tools_by_id.get(entry["tool_id"])
+        if not tool:
+            continue
+        # Convert MongoDB ObjectId to string for JSON serialization
+        if '_id' in tool:
+            tool['_id'] = str(tool['_id'])
+        tool["save_count"] = entry["save_count"]
+        trending_tools.append(tool)
     
-    return {"tool": tool}
+    return {"trending_tools": trending_tools}
+
+@app.get("/api/tools/{tool_id}/similar")
+async def get_similar_tools(tool_id: str, response: Response, limit: int = 5):
+    """Get tools most often saved together with the given tool"""
+    
+    response.headers["Cache-Control"] = STATS_CACHE_CONTROL
+    limit = max(1, min(limit, 20))
+    cosaves_cursor = db.tool_cosaves.find(
+        {"tool_id": tool_id, "count": {"$gt": 0}}
+    ).sort("count", -1).limit(limit)
+    cosaves = await cosaves_cursor.to_list(length=limit)
+    
+    other_ids = [entry["other_tool_id"] for entry in cosaves]
+    tools_cursor = db.tools.find({"id": {"$in": other_ids}})
+    tools = await tools_cursor.to_list(length=limit)
+    tools_by_id = {tool["id"]: tool for tool in tools}
+    
+    similar_tools = []
+    for entry in cosaves:
+        tool = tools_by_id.get(entry["other_tool_id"])
+        if not tool:
+            continue
+        # Convert MongoDB ObjectId to string for JSON serialization
+        if '_id' in tool:
+            tool['_id'] = str(tool['_id'])
+        tool["co_save_count"] = entry["count"]
+        similar_tools.append(tool)
+    
+    return {"similar_tools": similar_tools}
+
+@app.get("/api/tools/{tool_id}")
+async def get_tool_details(tool_id: str, request: Request):
+    """Get detailed information about a specific tool including AI summary"""
+    
+    async def build():
+        tool = await db.tools.find_one({"id": tool_id})
+        if not tool:
+            raise HTTPException(status_code=404, detail="Tool not found")
+        
+        # Convert MongoDB ObjectId to string for JSON serialization
+        if '_id' in tool:
+            tool['_id'] = str(tool['_id'])
+        
+        # Generate AI summary if not already available
+        if not tool.get("ai_summary"):
+            try:
+                ai_summary = await generate_tool_summary(tool)
+                if ai_summary is None:
+                    raise ValueError("AI summary unavailable")
+                tool["ai_summary"] = ai_summary
+                
+                # Update tool in database with AI summary
+                await db.tools.update_one(
+                    {"id": tool_id},
+                    {"$set": {"ai_summary": ai_summary}}
+                )
+                await bump_catalog_version()
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                # Fallback summary, not stored so it must not be cached either
+                tool["ai_summary"] = f"Professional {tool['category'].lower()} solution designed for {', '.join(tool['target_audience'])}. Known for {', '.join(tool['features'][:3])}."
+                return {"tool": tool}, False
+        
+        return {"tool": tool}, True
+    
+    return await catalog_response(request, f"tool:{tool_id}", build)
 
 @app.post("/api/users")
 async def create_user(user: UserProfile):
@@ -439,13 +950,21 @@ async def save_tool(saved_tool: SavedTool):
         "created_at": datetime.utcnow()
     }
     
-    await db.saved_tools.insert_one(saved_data)
+    try:
+        await db.saved_tools.insert_one(saved_data)
+    except DuplicateKeyError:
+        # A concurrent request saved the same tool first
+        raise HTTPException(status_code=400, detail="Tool already saved")
+    
+    await record_save_stats(saved_tool.user_id, saved_tool.tool_id, 1)
     return {"message": "Tool saved successfully"}
 
 @app.get("/api/saved-tools/{user_id}")
-async def get_saved_tools(user_id: str):
+async def get_saved_tools(user_id: str, response: Response):
     """Get user's saved tools"""
     
+    response.headers["Cache-Control"] = USER_CACHE_CONTROL
+    
     # Get saved tool IDs
     saved_tools_cursor = db.saved_tools.find({"user_id": user_id})
     saved_tools = await saved_tools_cursor.to_list(length=100)
@@ -469,9 +988,11 @@ async def get_saved_tools(user_id: str):
     return {"saved_tools": tools}
 
 @app.get("/api/recent-searches/{user_id}")
-async def get_recent_searches(user_id: str):
+async def get_recent_searches(user_id: str, response: Response):
     """Get user's recent questionnaire searches"""
     
+    response.headers["Cache-Control"] = USER_CACHE_CONTROL
+    
     recent_searches_cursor = db.questionnaires.find({"user_id": user_id}).sort("created_at", -1).limit(10)
     recent_searches = await recent_searches_cursor.to_list(length=10)
     
@@ -494,6 +1015,8 @@ async def remove_saved_tool(user_id: str, tool_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Saved tool not found")
     
+    await record_save_stats(user_id, tool_id, -1)
+    
     return {"message": "Tool removed from saved list"}
 
 if __name__ == "__main__":
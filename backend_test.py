@@ -56,6 +56,33 @@ def test_root_endpoint():
     assert "message" in response.json(), "Root endpoint response missing 'message' field"
     print("✅ Root endpoint test passed")
 
+def test_health_and_readiness_endpoints():
+    """Test the liveness and readiness probes"""
+    print("\n🧪 Testing health and readiness endpoints...")
+    base_url = BACKEND_URL.rstrip("/api")
+    
+    response = requests.get(f"{base_url}/healthz")
+    assert response.status_code == 200, f"Health endpoint failed: {response.text}"
+    assert response.json()["status"] == "ok", "Health endpoint did not report ok"
+    
+    # Readiness may lag a freshly started server while the seed check runs
+    for _ in range(10):
+        response = requests.get(f"{base_url}/readyz")
+        if response.status_code == 200:
+            break
+        time.sleep(1)
+    assert response.status_code == 200, f"Readiness endpoint not ready: {response.text}"
+    data = response.json()
+    assert data["status"] == "ready", "Readiness endpoint did not report ready"
+    assert "seed" in data["timings_ms"], "Readiness response missing seed timing"
+    
+    # Seeding is idempotent across restarts, so no curated tool appears twice
+    tools = requests.get(f"{API_URL}/tools").json()["tools"]
+    names = [tool["name"] for tool in tools]
+    assert len(names) == len(set(names)), "Duplicate tools found after seeding"
+    
+    print("✅ Health and readiness endpoints test passed")
+
 def test_questionnaire_endpoint():
     """Test the questionnaire endpoint for AI recommendations"""
     print("\n🧪 Testing questionnaire endpoint...")
@@ -125,6 +152,27 @@ def test_tool_details_endpoint(tools: List[Dict[str, Any]]):
     print(f"✅ Tool details endpoint test passed - received AI summary for {tool['name']}")
     return tool
 
+def test_catalog_conditional_requests(tool: Dict[str, Any]):
+    """Test ETag validation and compression on catalog routes"""
+    print("\n🧪 Testing catalog conditional requests...")
+    for url in (f"{API_URL}/tools", f"{API_URL}/tools/{tool['id']}"):
+        response = requests.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200, f"Catalog request failed: {response.text}"
+        etag = response.headers.get("ETag")
+        assert etag, f"Response from {url} missing ETag"
+        assert "Cache-Control" in response.headers, f"Response from {url} missing Cache-Control"
+        
+        # A matching validator should return 304 with no body
+        cached_response = requests.get(url, headers={"If-None-Match": etag})
+        assert cached_response.status_code == 304, f"Expected 304 for {url}, got {cached_response.status_code}"
+        assert cached_response.headers.get("ETag") == etag, "ETag changed between requests"
+    
+    # The full catalog is above the compression threshold
+    response = requests.get(f"{API_URL}/tools", headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("Content-Encoding") == "gzip", "Catalog response not compressed"
+    
+    print("✅ Catalog conditional requests test passed")
+
 def test_user_profile_endpoint():
     """Test user profile creation"""
     print("\n🧪 Testing user profile endpoint...")
@@ -195,6 +243,46 @@ def test_recent_searches_endpoint(user: Dict[str, Any]):
     
     print(f"✅ Recent searches endpoint test passed")
 
+def test_tool_statistics_endpoints(user: Dict[str, Any], tools: List[Dict[str, Any]]):
+    """Test co-save based similar tools and trending tools"""
+    print("\n🧪 Testing tool statistics endpoints...")
+    user_id = user["id"]
+    first_id = tools[0]["id"]
+    second_id = tools[1]["id"]
+    
+    # Save two tools so they form a co-save pair
+    for tool_id in (first_id, second_id):
+        save_response = requests.post(f"{API_URL}/saved-tools", json={
+            "user_id": user_id,
+            "tool_id": tool_id
+        })
+        assert save_response.status_code == 200, f"Save tool endpoint failed: {save_response.text}"
+    
+    similar_response = requests.get(f"{API_URL}/tools/{first_id}/similar")
+    assert similar_response.status_code == 200, f"Similar tools endpoint failed: {similar_response.text}"
+    similar_counts = {t["id"]: t["co_save_count"] for t in similar_response.json()["similar_tools"]}
+    assert second_id in similar_counts, f"Co-saved tool {second_id} not in similar tools"
+    
+    trending_response = requests.get(f"{API_URL}/tools/trending", params={"limit": 50})
+    assert trending_response.status_code == 200, f"Trending tools endpoint failed: {trending_response.text}"
+    trending_counts = {t["id"]: t["save_count"] for t in trending_response.json()["trending_tools"]}
+    for tool_id in (first_id, second_id):
+        assert tool_id in trending_counts, f"Saved tool {tool_id} not in trending tools"
+        assert trending_counts[tool_id] >= 1, f"Saved tool {tool_id} has no saves counted"
+    
+    # Clean up saved tools
+    for tool_id in (first_id, second_id):
+        delete_response = requests.delete(f"{API_URL}/saved-tools/{user_id}/{tool_id}")
+        assert delete_response.status_code == 200, f"Delete saved tool endpoint failed: {delete_response.text}"
+    
+    # Removing the saves should take this user's pair back out of the co-save count
+    similar_response = requests.get(f"{API_URL}/tools/{first_id}/similar")
+    similar_counts_after = {t["id"]: t["co_save_count"] for t in similar_response.json()["similar_tools"]}
+    assert similar_counts_after.get(second_id, 0) == similar_counts[second_id] - 1, \
+        f"Co-save count for {second_id} not decremented after removal"
+    
+    print(f"✅ Tool statistics endpoints test passed")
+
 def run_all_tests():
     """Run all tests in sequence"""
     print("\n🚀 Starting backend API tests...")
@@ -202,10 +290,12 @@ def run_all_tests():
     try:
         # Test basic endpoints
         test_root_endpoint()
+        test_health_and_readiness_endpoints()
         
         # Test tools endpoints
         tools = test_tools_endpoint()
         tool = test_tool_details_endpoint(tools)
+        test_catalog_conditional_requests(tool)
         
         # Test questionnaire and recommendations
         questionnaire_data = test_questionnaire_endpoint()
@@ -214,6 +304,7 @@ def run_all_tests():
         user = test_user_profile_endpoint()
         test_saved_tools_endpoints(user, tool)
         test_recent_searches_endpoint(user)
+        test_tool_statistics_endpoints(user, tools)
         
         print("\n✅ All backend tests passed successfully! ✅")
         return True